@@ -14,8 +14,60 @@ import pandas as pd
 import numpy as np
 import json
 import os
+import base64
+import gzip
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+CACHE_DIR = '.cache'
+COLOR_BINS = 64  # number of quantized heatmap colors emitted as CSS classes
+
+def read_excel_cached(path, **kwargs):
+    """Read an Excel file, reusing a pickled copy while the source file and read options are unchanged"""
+    stat = os.stat(path)
+    name = os.path.basename(path)
+    # Read options (e.g. index_col) are part of the key, so a frame parsed
+    # with different options is never served from the cache
+    options = hashlib.md5(repr(sorted(kwargs.items())).encode('utf-8')).hexdigest()[:8]
+    cache_file = os.path.join(CACHE_DIR, f"{name}.{stat.st_mtime_ns}.{stat.st_size}.{options}.pkl")
+    if os.path.exists(cache_file):
+        try:
+            return pd.read_pickle(cache_file)
+        except Exception as e:
+            # Truncated, or written by an incompatible pandas - rebuild it from the workbook
+            print(f"⚠️ Ignoring unreadable cache for {path}: {e}")
+            try:
+                os.remove(cache_file)
+            except OSError:
+                pass
+    
+    try:
+        # Rust-based calamine parser when python-calamine is installed (pandas >= 2.2)
+        df = pd.read_excel(path, engine='calamine', **kwargs)
+    except (ImportError, ValueError):
+        # Fall back to pandas' default openpyxl reader
+        df = pd.read_excel(path, **kwargs)
+    
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Drop caches (and partial writes) left behind by earlier versions of this file
+        for old in os.listdir(CACHE_DIR):
+            if old.startswith(f"{name}.") and old.endswith(('.pkl', '.tmp')):
+                os.remove(os.path.join(CACHE_DIR, old))
+        # Write to a temporary file first so an interrupted run never leaves a
+        # truncated pickle under the final name
+        df.to_pickle(tmp_file)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"⚠️ Could not cache {path}: {e}")
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+    return df
+
 def load_and_process_data():
     """Load and process the tobacco data"""
     print("=" * 70)
@@ -23,9 +75,14 @@ def load_and_process_data():
     print("Loading and processing data...")
     print("=" * 70)
     
+    # Read both workbooks concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        data_future = executor.submit(read_excel_cached, 'Data_Raw.xlsx', index_col=0)
+        sensory_future = executor.submit(read_excel_cached, 'Sensory_Note.xlsx')
+    
     # Load main data
     try:
-        df = pd.read_excel('Data_Raw.xlsx', index_col=0)
+        df = data_future.result()
         print(f"✅ Loaded main data: {df.shape[0]} recipes × {df.shape[1]} ingredients")
     except Exception as e:
         print(f"❌ Error loading Data_Raw.xlsx: {e}")
@@ -33,7 +90,7 @@ def load_and_process_data():
     
     # Load sensory notes
     try:
-        sensory_df = pd.read_excel('Sensory_Note.xlsx')
+        sensory_df = sensory_future.result()
         print(f"✅ Loaded sensory notes: {len(sensory_df)} ingredient classifications")
     except Exception as e:
         print(f"❌ Error loading Sensory_Note.xlsx: {e}")
@@ -68,13 +125,9 @@ def create_sensory_groups(df, sensory_df):
     print("\n🧪 INGREDIENT SENSORY GROUPING")
     print("-" * 40)
     
-    # Create sensory note mapping
-    sensory_map = {}
-    for _, row in sensory_df.iterrows():
-        ingredient = row['product']
-        sensory_note = row['Sensory Note']
-        if pd.notna(ingredient) and pd.notna(sensory_note):
-            sensory_map[ingredient] = sensory_note
+    # Create sensory note mapping (rows need both product and note)
+    valid = sensory_df.dropna(subset=['product', 'Sensory Note'])
+    sensory_map = dict(zip(valid['product'].to_numpy(), valid['Sensory Note'].to_numpy()))
     
     print(f"Sensory notes for {len(sensory_map)} ingredients")
     
@@ -84,12 +137,12 @@ def create_sensory_groups(df, sensory_df):
         'Dry': [], 'Harsh': [], 'Cooling': [], 'Ungrouped': []
     }
     
-    for ingredient in df.columns:
-        sensory_note = sensory_map.get(ingredient, 'Ungrouped')
-        if sensory_note in sensory_groups:
-            sensory_groups[sensory_note].append(ingredient)
-        else:
-            sensory_groups['Ungrouped'].append(ingredient)
+    # Unknown or unlisted notes fall into 'Ungrouped'; column order is kept within each group
+    columns = pd.Series(df.columns)
+    notes = columns.map(sensory_map)
+    notes = notes.where(notes.isin(list(sensory_groups)), 'Ungrouped')
+    for group_name, members in columns.groupby(notes.to_numpy(), sort=False):
+        sensory_groups[group_name] = members.tolist()
     
     # Print grouping summary
     for group, ingredients in sensory_groups.items():
@@ -104,6 +157,10 @@ def organize_data(df, tobacco_groups, sensory_groups):
     print("\n📊 ORGANIZING DATA FOR HTML EXPORT")
     print("-" * 40)
     
+    # Hashed lookups for the membership tests below
+    col_set = set(df.columns)
+    idx_set = set(df.index)
+    
     # Order recipes by user-specified order
     desired_order = [
         "J1 Virginia Tobacco 5%",
@@ -117,24 +174,20 @@ def organize_data(df, tobacco_groups, sensory_groups):
         "Golden Tobacco 5% J1 (345-00124)",
         "TOBACCO(AMERICAN) 5% (E-400469)"
     ]
-    recipe_order = [r for r in desired_order if r in df.index]
+    recipe_order = [r for r in desired_order if r in idx_set]
+    recipe_set = set(recipe_order)
     recipe_groups = {}
     for group_name, recipes in tobacco_groups.items():
         for recipe in recipes:
-            if recipe in recipe_order:
+            if recipe in recipe_set:
                 recipe_groups[recipe] = group_name
     
     # Filter ingredients to only include those used in selected recipes
-    # Create subset of data with only selected recipes
-    selected_df = df.loc[recipe_order]
-    
-    # Find ingredients that have non-zero values in at least one selected recipe
-    used_ingredients = []
-    for ingredient in df.columns:
-        if (selected_df[ingredient] > 0).any():
-            used_ingredients.append(ingredient)
-    
-    print(f"  Ingredients with non-zero values: {len(used_ingredients)} of {len(df.columns)} total")
+    # Find ingredients that have non-zero values in at least one selected recipe,
+    # as one comparison over the selected rows' array (NaN compares as False)
+    used_mask = (df.loc[recipe_order].to_numpy(dtype=float, na_value=np.nan) > 0).any(axis=0)
+    used_set = set(df.columns[used_mask])
+    print(f"  Ingredients with non-zero values: {len(used_set)} of {len(df.columns)} total")
     
     # Order ingredients by sensory groups (only include used ingredients)
     ingredient_order = []
@@ -143,13 +196,13 @@ def organize_data(df, tobacco_groups, sensory_groups):
     
     for group_name in sensory_group_order:
         for ingredient in sensory_groups[group_name]:
-            if ingredient in df.columns and ingredient in used_ingredients:
+            if ingredient in col_set and ingredient in used_set:
                 ingredient_order.append(ingredient)
                 ingredient_groups[ingredient] = group_name
     
     # Add ungrouped ingredients at the end (only if used)
     for ingredient in sensory_groups['Ungrouped']:
-        if ingredient in df.columns and ingredient in used_ingredients:
+        if ingredient in col_set and ingredient in used_set:
             ingredient_order.append(ingredient)
             ingredient_groups[ingredient] = 'Ungrouped'
     
@@ -158,62 +211,54 @@ def organize_data(df, tobacco_groups, sensory_groups):
     
     return recipe_order, ingredient_order, recipe_groups, ingredient_groups
 
-def generate_html_file(df, recipe_order, ingredient_order, recipe_groups, ingredient_groups, tobacco_groups):
-    """Generate the standalone HTML file with embedded JavaScript"""
-    
-    # Prepare data for JavaScript
-    heatmap_data = []
-    for recipe in recipe_order:
-        row_data = []
-        for ingredient in ingredient_order:
-            value = df.loc[recipe, ingredient] if ingredient in df.columns else 0
-            row_data.append(float(value) if pd.notna(value) else 0)
-        heatmap_data.append(row_data)
-    
-    # Group headers for display
-    group_headers = {
-        'G1 - MGO and Filed': 'G1',
-        'G2': 'G2', 
-        'G3': 'G3',
-        'G4 - Unique': 'G4'
-    }
-    
-    # Organize recipes by groups for buttons
-    grouped_recipes = {}
-    for group_name in ['G1 - MGO and Filed', 'G2', 'G3', 'G4 - Unique']:
-        grouped_recipes[group_name] = [recipe for recipe in recipe_order if recipe_groups.get(recipe) == group_name]
-    
-    # Organize ingredients by sensory groups for column headers
-    sensory_group_order = ['Sweet', 'Dry', 'Rich', 'Light', 'Smooth', 'Harsh', 'Cooling', 'Ungrouped']
-    grouped_ingredients = {}
-    for group_name in sensory_group_order:
-        grouped_ingredients[group_name] = [ing for ing in ingredient_order if ingredient_groups.get(ing) == group_name]
+def build_display_matrix(df, recipe_order, ingredient_order):
+    """Build the recipe × ingredient matrix shown in the heatmap (missing cells become 0)"""
+    # Little-endian float32, so the bytes can be embedded as-is and decoded
+    # into a Float32Array by the page
+    return df.reindex(index=recipe_order, columns=ingredient_order).to_numpy(
+        dtype='<f4', na_value=0.0
+    )
+
+def build_viridis_lut(size=256):
+    """Sample the 5-stop viridis approximation into a (size, 3) uint8 RGB table"""
+    stops = np.array([
+        [68, 1, 84],      # Dark purple
+        [59, 82, 139],    # Blue-purple
+        [33, 144, 141],   # Teal
+        [94, 201, 98],    # Green
+        [253, 231, 37]    # Yellow
+    ], dtype=np.float64)
     
-    html_content = f"""<!DOCTYPE html>
+    positions = np.linspace(0, len(stops) - 1, size)
+    stop_index = np.arange(len(stops))
+    lut = np.column_stack([np.interp(positions, stop_index, stops[:, c]) for c in range(3)])
+    return np.clip(np.round(lut), 0, 255).astype(np.uint8)
+
+HTML_HEADER = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Interactive Tobacco Heatmap</title>
     <style>
-        body {{
+        body {
             font-family: Arial, sans-serif;
             margin: 0;
             padding: 5px;
             background-color: #f5f5f5;
             height: 100vh;
             overflow: hidden;
-        }}
+        }
         
-        .container {{
+        .container {
             display: flex;
             flex-direction: column;
             height: calc(100vh - 10px);
             width: calc(100vw - 10px);
             overflow: hidden;
-        }}
+        }
         
-        .top-controls {{
+        .top-controls {
             background: white;
             padding: 8px 12px;
             border-radius: 6px;
@@ -224,24 +269,24 @@ def generate_html_file(df, recipe_order, ingredient_order, recipe_groups, ingred
             gap: 15px;
             flex-shrink: 0;
             height: 40px;
-        }}
+        }
         
-        .threshold-label {{
+        .threshold-label {
             font-size: 14px;
             font-weight: bold;
             margin-right: 5px;
             color: #333;
-        }}
+        }
         
-        .threshold-input {{
+        .threshold-input {
             padding: 5px;
             border: 2px solid #888;
             border-radius: 3px;
             font-size: 12px;
             width: 100px;
-        }}
+        }
         
-        .heatmap-container {{
+        .heatmap-container {
             flex: 1;
             background: white;
             padding: 8px;
@@ -253,33 +298,33 @@ def generate_html_file(df, recipe_order, ingredient_order, recipe_groups, ingred
             margin-bottom: 5px;
             gap: 10px;
             min-height: 0;
-        }}
+        }
         
-        .heatmap-wrapper {{
+        .heatmap-wrapper {
             flex: 1;
             overflow: auto;
             min-height: 0;
             min-width: 0;
             position: relative;
-        }}
+        }
         
-        .color-scale {{
+        .color-scale {
             width: 60px;
             display: flex;
             flex-direction: column;
             align-items: center;
             flex-shrink: 0;
-        }}
+        }
         
-        .color-scale-title {{
+        .color-scale-title {
             font-size: 10px;
             font-weight: bold;
             margin-bottom: 8px;
             text-align: center;
             color: #333;
-        }}
+        }
         
-        .color-scale-bar {{
+        .color-scale-bar {
             width: 16px;
             height: 150px;
             border: 1px solid #ccc;
@@ -291,9 +336,9 @@ def generate_html_file(df, recipe_order, ingredient_order, recipe_groups, ingred
                 rgb(33, 144, 141) 50%, 
                 rgb(94, 201, 98) 75%, 
                 rgb(253, 231, 37) 100%);
-        }}
+        }
         
-        .color-scale-labels {{
+        .color-scale-labels {
             display: flex;
             flex-direction: column;
             justify-content: space-between;
@@ -301,22 +346,22 @@ def generate_html_file(df, recipe_order, ingredient_order, recipe_groups, ingred
             margin-left: 5px;
             font-size: 9px;
             color: #666;
-        }}
+        }
         
-        .color-scale-label {{
+        .color-scale-label {
             line-height: 1;
-        }}
+        }
         
-        .heatmap {{
+        .heatmap {
             border-collapse: collapse;
             font-size: 8px;
             width: 100%;
             height: fit-content;
             table-layout: auto;
-        }}
+        }
         
         .heatmap th,
-        .heatmap td {{
+        .heatmap td {
             border: 1px solid white;
             padding: 1px;
             text-align: center;
@@ -324,17 +369,17 @@ def generate_html_file(df, recipe_order, ingredient_order, recipe_groups, ingred
             max-width: 10px;
             height: 14px;
             font-size: 7px;
-        }}
+        }
         
-        .heatmap th {{
+        .heatmap th {
             background-color: #f0f0f0;
             font-weight: bold;
             position: sticky;
             top: 0;
             z-index: 10;
-        }}
+        }
         
-        .heatmap .recipe-label {{
+        .heatmap .recipe-label {
             background-color: #f0f0f0;
             font-weight: bold;
             text-align: left;
@@ -351,9 +396,9 @@ def generate_html_file(df, recipe_order, ingredient_order, recipe_groups, ingred
             font-size: 7px;
             box-shadow: 2px 0 5px rgba(0,0,0,0.1);
             border-right: 2px solid #ccc;
-        }}
+        }
         
-        .recipe-button {{
+        .recipe-button {
             position: absolute;
             right: 4px;
             top: 2px;
@@ -369,26 +414,26 @@ def generate_html_file(df, recipe_order, ingredient_order, recipe_groups, ingred
             justify-content: center;
             transition: background-color 0.2s;
             z-index: 16;
-        }}
+        }
         
-        .recipe-button:hover {{
+        .recipe-button:hover {
             background-color: #d0d0d0;
-        }}
+        }
         
-        .recipe-button.selected {{
+        .recipe-button.selected {
             background-color: #4CAF50;
             color: white;
-        }}
+        }
         
-        .recipe-text {{
+        .recipe-text {
             padding-right: 24px;
             display: block;
             width: 100%;
             overflow: hidden;
             text-overflow: ellipsis;
-        }}
+        }
         
-        .sensory-group-header {{
+        .sensory-group-header {
             font-weight: bold;
             font-size: 16px;
             color: #000000;
@@ -396,9 +441,9 @@ def generate_html_file(df, recipe_order, ingredient_order, recipe_groups, ingred
             border: 2px solid #000080;
             padding: 2px 4px;
             text-align: center;
-        }}
+        }
         
-        .ingredient-header {{
+        .ingredient-header {
             writing-mode: vertical-rl;
             text-orientation: mixed;
             font-size: 7px;
@@ -412,27 +457,51 @@ def generate_html_file(df, recipe_order, ingredient_order, recipe_groups, ingred
             padding: 1px;
             white-space: nowrap;
             vertical-align: top;
-        }}
+        }
+        
+        /* Header cells override the generic .heatmap td sizing through these
+           rules rather than per-element inline styles */
+        .heatmap .corner-label {
+            z-index: 20;
+        }
+        
+        .heatmap .sensory-group-header {
+            font-size: 16px;
+            border-bottom: 2px solid #ddd;
+        }
+        
+        .heatmap .ingredient-header {
+            font-size: 10px;
+            padding: 4px 2px;
+        }
         
-        .heatmap-cell {{
+        .heatmap-cell {
             cursor: pointer;
-            transition: all 0.2s;
-        }}
-        
-        .heatmap-cell:hover {{
-            border: 2px solid #333;
-        }}
-        
-        .sweet {{ border-top: 3px solid #FF0000; border-left: 2px solid #FF0000; }}
-        .dry {{ border-top: 3px solid #00FF00; border-left: 2px solid #00FF00; }}
-        .rich {{ border-top: 3px solid #FF0000; border-left: 2px solid #FF0000; }}
-        .light {{ border-top: 3px solid #00FF00; border-left: 2px solid #00FF00; }}
-        .smooth {{ border-top: 3px solid #FF0000; border-left: 2px solid #FF0000; }}
-        .harsh {{ border-top: 3px solid #00FF00; border-left: 2px solid #00FF00; }}
-        .cooling {{ border-top: 3px solid #FF0000; border-left: 2px solid #FF0000; }}
-        .ungrouped {{ border-top: 3px solid #808080; border-left: 2px solid #808080; }}
-        
-        .tooltip {{
+            transition: background-color 0.2s;
+            background-color: rgba(var(--cell-rgb), var(--cell-alpha, 1));
+        }
+        
+        .heatmap-cell.deselected { --cell-alpha: 0.1; }
+        .heatmap-cell.blank { --cell-rgb: 240, 240, 240; }
+        .heatmap-cell.below { background-color: #f0f0f0; }
+        
+        /* Outline instead of a wider border: hovering repaints one cell
+           rather than re-running layout for the whole collapsed-border table */
+        .heatmap-cell:hover {
+            outline: 2px solid #333;
+            outline-offset: -2px;
+        }
+        
+        .sweet { border-top: 3px solid #FF0000; border-left: 2px solid #FF0000; }
+        .dry { border-top: 3px solid #00FF00; border-left: 2px solid #00FF00; }
+        .rich { border-top: 3px solid #FF0000; border-left: 2px solid #FF0000; }
+        .light { border-top: 3px solid #00FF00; border-left: 2px solid #00FF00; }
+        .smooth { border-top: 3px solid #FF0000; border-left: 2px solid #FF0000; }
+        .harsh { border-top: 3px solid #00FF00; border-left: 2px solid #00FF00; }
+        .cooling { border-top: 3px solid #FF0000; border-left: 2px solid #FF0000; }
+        .ungrouped { border-top: 3px solid #808080; border-left: 2px solid #808080; }
+        
+        .tooltip {
             position: absolute;
             background: rgba(0, 0, 0, 0.8);
             color: white;
@@ -442,8 +511,20 @@ def generate_html_file(df, recipe_order, ingredient_order, recipe_groups, ingred
             pointer-events: none;
             z-index: 1000;
             display: none;
-        }}
-    </style>
+        }
+        
+        .load-error {
+            margin: 20px;
+            padding: 12px 16px;
+            border: 1px solid #d9534f;
+            border-radius: 4px;
+            background-color: #fdf2f2;
+            color: #a94442;
+            font-size: 14px;
+        }
+"""
+
+HTML_BODY = """    </style>
 </head>
 <body>
     <div class="container">
@@ -483,70 +564,37 @@ def generate_html_file(df, recipe_order, ingredient_order, recipe_groups, ingred
 
     <script>
         // Data embedded from Python processing
-        const heatmapData = {json.dumps(heatmap_data)};
-        const recipeOrder = {json.dumps(recipe_order)};
-        const ingredientOrder = {json.dumps(ingredient_order)};
-        const groupedRecipes = {json.dumps(grouped_recipes)};
-        const groupedIngredients = {json.dumps(grouped_ingredients)};
-        const groupHeaders = {json.dumps(group_headers)};
-        
-        let selectedRecipes = new Set();
-        let currentThreshold = 0.4;
-        
-        // Color scale function (viridis-like)
-        function getColor(value, opacity = 1) {{
-            if (value <= 0 || isNaN(value)) return `rgba(240, 240, 240, ${{opacity}})`;
-            
-            // Viridis color scale approximation
-            const colors = [
-                [68, 1, 84],      // Dark purple
-                [59, 82, 139],    // Blue-purple  
-                [33, 144, 141],   // Teal
-                [94, 201, 98],    // Green
-                [253, 231, 37]    // Yellow
-            ];
-            
-            const scaledValue = Math.min(Math.max(value, 0), 1);
-            const index = scaledValue * (colors.length - 1);
-            const lowerIndex = Math.floor(index);
-            const upperIndex = Math.ceil(index);
-            const fraction = index - lowerIndex;
-            
-            if (lowerIndex === upperIndex) {{
-                const [r, g, b] = colors[lowerIndex];
-                return `rgba(${{r}}, ${{g}}, ${{b}}, ${{opacity}})`;
-            }}
-            
-            const [r1, g1, b1] = colors[lowerIndex];
-            const [r2, g2, b2] = colors[upperIndex];
-            
-            const r = Math.round(r1 + (r2 - r1) * fraction);
-            const g = Math.round(g1 + (g2 - g1) * fraction);
-            const b = Math.round(b1 + (b2 - b1) * fraction);
-            
-            return `rgba(${{r}}, ${{g}}, ${{b}}, ${{opacity}})`;
-        }}
+"""
+
+HTML_FOOTER = """        
+        // Filled in by loadPayload() once the embedded data has been decompressed.
+        // heatmapData is a row-major float32 matrix: value of (row, col) is
+        // heatmapData[row * numCols + col]
+        let recipeOrder, ingredientOrder, groupSizes, displayNames;
+        let numCols, heatmapData;
+        let ingredientGroupByIndex;  // sensory group of each column, expanded from groupSizes
+        
+        let selectedRows;  // Uint8Array flag per row of recipeOrder, filled by loadPayload
+        let selectedCount = 0;  // number of rows flagged in selectedRows
+        // Thresholds are rounded to float32 like the cell values, so a typed value
+        // such as 0.45 still includes cells stored as 0.45 (0.44999998... in float32)
+        let currentThreshold = Math.fround(0.4);
+        let paintedThreshold = currentThreshold;  // threshold the cells currently reflect
+        let heatmapCells = [];  // data cells in row-major order, filled by createHeatmap
+        let cellColorClasses = [];  // current color class of each data cell
+        let updatePending = false;
+        
+        // Color bin classes (.v0 ... .vN), generated from the viridis table in the <style> block
+        const binClasses = Array.from({ length: colorBinCount }, (_, i) => `v${i}`);
         
         // Helper functions for sensory group borders
-        function getIngredientGroup(ingredient) {{
-            for (const [groupName, ingredients] of Object.entries(groupedIngredients)) {{
-                if (ingredients.includes(ingredient)) {{
-                    return groupName;
-                }}
-            }}
-            return 'Ungrouped';
-        }}
-        
-        function isFirstInGroup(ingredient, colIndex) {{
-            if (colIndex === 0) return true;
-            const currentGroup = getIngredientGroup(ingredient);
-            const prevIngredient = ingredientOrder[colIndex - 1];
-            const prevGroup = getIngredientGroup(prevIngredient);
-            return currentGroup !== prevGroup;
-        }}
-        
-        function getGroupColor(groupName) {{
-            const colors = {{
+        function isFirstInGroup(colIndex) {
+            return colIndex === 0 ||
+                ingredientGroupByIndex[colIndex] !== ingredientGroupByIndex[colIndex - 1];
+        }
+        
+        function getGroupColor(groupName) {
+            const colors = {
                 'Sweet': '#FF0000',
                 'Dry': '#00FF00', 
                 'Rich': '#FF0000',
@@ -555,236 +603,400 @@ def generate_html_file(df, recipe_order, ingredient_order, recipe_groups, ingred
                 'Harsh': '#00FF00',
                 'Cooling': '#FF0000',
                 'Ungrouped': '#808080'
-            }};
+            };
             return colors[groupName] || '#808080';
-        }}
-        
-        function getRecipeGroup(recipe) {{
-            for (const [groupName, recipes] of Object.entries(groupedRecipes)) {{
-                if (recipes.includes(recipe)) {{
-                    return groupHeaders[groupName] || groupName;
-                }}
-            }}
-            return '';
-        }}
-        
-        function getDisplayRecipeName(recipe) {{
-            const groupPrefix = getRecipeGroup(recipe);
-            return groupPrefix ? `${{groupPrefix}}-${{recipe}}` : recipe;
-        }}
-        
-        function toggleRecipe(recipe, button) {{
-            if (selectedRecipes.has(recipe)) {{
-                selectedRecipes.delete(recipe);
+        }
+        
+        function toggleRecipe(rowIndex, button) {
+            const hadSelection = selectedCount > 0;
+            if (selectedRows[rowIndex]) {
+                selectedRows[rowIndex] = 0;
+                selectedCount--;
                 button.classList.remove('selected');
-            }} else {{
-                selectedRecipes.add(recipe);
+            } else {
+                selectedRows[rowIndex] = 1;
+                selectedCount++;
                 button.classList.add('selected');
-            }}
-            updateHeatmap();
-        }}
+            }
+            
+            // Selecting the first recipe or clearing the last one changes the fading
+            // of every row; any other toggle only changes the toggled row. A single
+            // row can only be repainted while the grid is in sync with the current
+            // threshold (no threshold band still waiting for its animation frame)
+            if (hadSelection && selectedCount > 0 && paintedThreshold === currentThreshold) {
+                repaintRow(rowIndex);
+            } else {
+                updateHeatmap();
+            }
+        }
         
-        function createHeatmap() {{
+        function createHeatmap() {
             const table = document.getElementById('heatmap-table');
             table.innerHTML = '';
+            heatmapCells = [];
+            cellColorClasses = [];
+            
+            // Rows are assembled off-document and attached to the table once
+            const fragment = document.createDocumentFragment();
+            
+            // Data cells are cloned from one template per column, which carries the
+            // column's sensory group class and, for the first ingredient in each
+            // group, the group's left border; these are worked out once, not per row
+            const columnTemplates = ingredientOrder.map((ingredient, colIndex) => {
+                const cellTemplate = document.createElement('td');
+                cellTemplate.className = 'heatmap-cell';
+                
+                // Add sensory group border styling
+                const ingredientGroup = ingredientGroupByIndex[colIndex];
+                if (ingredientGroup) {
+                    cellTemplate.classList.add(ingredientGroup.toLowerCase());
+                }
+                
+                // Add left border for first ingredient in each group
+                if (isFirstInGroup(colIndex)) {
+                    cellTemplate.style.borderLeft = `3px solid ${getGroupColor(ingredientGroup)}`;
+                }
+                return cellTemplate;
+            });
             
             // Create sensory header row
             const sensoryHeaderRow = document.createElement('tr');
             
             // Empty cell for recipe column
             const emptyHeader = document.createElement('td');
-            emptyHeader.className = 'recipe-label';
-            emptyHeader.textContent = '';
-            emptyHeader.style.position = 'sticky';
-            emptyHeader.style.left = '0';
-            emptyHeader.style.zIndex = '20';
-            emptyHeader.style.backgroundColor = '#f0f0f0';
-            emptyHeader.style.boxShadow = '2px 0 5px rgba(0,0,0,0.1)';
-            emptyHeader.style.borderRight = '2px solid #ccc';
+            emptyHeader.className = 'recipe-label corner-label';
             sensoryHeaderRow.appendChild(emptyHeader);
             
             // Add sensory group headers
-            Object.entries(groupedIngredients).forEach(([groupName, ingredients]) => {{
-                if (ingredients.length === 0) return;
+            Object.entries(groupSizes).forEach(([groupName, size]) => {
+                if (size === 0) return;
                 
                 const groupHeader = document.createElement('td');
-                groupHeader.className = `sensory-group-header ${{groupName.toLowerCase()}}`;
-                groupHeader.colSpan = ingredients.length;
+                groupHeader.className = `sensory-group-header ${groupName.toLowerCase()}`;
+                groupHeader.colSpan = size;
                 groupHeader.textContent = groupName;
-                groupHeader.style.textAlign = 'center';
-                groupHeader.style.fontWeight = 'bold';
-                groupHeader.style.fontSize = '16px';
-                groupHeader.style.color = 'black';
-                groupHeader.style.borderBottom = '2px solid #ddd';
                 sensoryHeaderRow.appendChild(groupHeader);
-            }});
-            table.appendChild(sensoryHeaderRow);
+            });
+            fragment.appendChild(sensoryHeaderRow);
             
             // Create data rows
-            recipeOrder.forEach((recipe, rowIndex) => {{
+            recipeOrder.forEach((recipe, rowIndex) => {
                 const row = document.createElement('tr');
                 
                 // Recipe label with button
                 const labelCell = document.createElement('td');
                 labelCell.className = 'recipe-label';
-                labelCell.title = getDisplayRecipeName(recipe);
+                labelCell.title = displayNames[rowIndex];
                 
                 // Create recipe text span
                 const recipeText = document.createElement('span');
                 recipeText.className = 'recipe-text';
-                recipeText.textContent = getDisplayRecipeName(recipe);
+                recipeText.textContent = displayNames[rowIndex];
                 
                 // Create recipe button
                 const recipeButton = document.createElement('button');
                 recipeButton.className = 'recipe-button';
                 recipeButton.textContent = '●';
-                recipeButton.title = `Click to select/deselect ${{getDisplayRecipeName(recipe)}}`;
-                recipeButton.onclick = () => toggleRecipe(recipe, recipeButton);
+                recipeButton.title = `Click to select/deselect ${displayNames[rowIndex]}`;
+                recipeButton.onclick = () => toggleRecipe(rowIndex, recipeButton);
                 
                 labelCell.appendChild(recipeText);
                 labelCell.appendChild(recipeButton);
                 row.appendChild(labelCell);
                 
                 // Data cells
-                ingredientOrder.forEach((ingredient, colIndex) => {{
-                    const cell = document.createElement('td');
-                    cell.className = 'heatmap-cell';
-                    cell.dataset.recipe = recipe;
-                    cell.dataset.ingredient = ingredient;
-                    cell.dataset.value = heatmapData[rowIndex][colIndex];
-                    
-                    // Add sensory group border styling
-                    const ingredientGroup = getIngredientGroup(ingredient);
-                    if (ingredientGroup) {{
-                        cell.classList.add(ingredientGroup.toLowerCase());
-                    }}
-                    
-                    // Add left border for first ingredient in each group
-                    if (isFirstInGroup(ingredient, colIndex)) {{
-                        cell.style.borderLeft = `3px solid ${{getGroupColor(ingredientGroup)}}`;
-                    }}
-                    
-                    // Add tooltip functionality
-                    cell.addEventListener('mouseenter', showTooltip);
-                    cell.addEventListener('mouseleave', hideTooltip);
-                    cell.addEventListener('mousemove', moveTooltip);
-                    
+                columnTemplates.forEach((cellTemplate, colIndex) => {
+                    const cell = cellTemplate.cloneNode(false);
+                    cell.dataset.idx = rowIndex * numCols + colIndex;
                     row.appendChild(cell);
-                }});
+                    heatmapCells.push(cell);
+                });
                 
-                table.appendChild(row);
-            }});
+                fragment.appendChild(row);
+            });
             
             // Create ingredient names row at the bottom
             const ingredientRow = document.createElement('tr');
             
             // Empty cell for recipe column
             const emptyFooter = document.createElement('td');
-            emptyFooter.className = 'recipe-label';
-            emptyFooter.textContent = '';
-            emptyFooter.style.position = 'sticky';
-            emptyFooter.style.left = '0';
-            emptyFooter.style.zIndex = '20';
-            emptyFooter.style.backgroundColor = '#f0f0f0';
-            emptyFooter.style.boxShadow = '2px 0 5px rgba(0,0,0,0.1)';
-            emptyFooter.style.borderRight = '2px solid #ccc';
+            emptyFooter.className = 'recipe-label corner-label';
             ingredientRow.appendChild(emptyFooter);
             
             // Add ingredient names
-            ingredientOrder.forEach(ingredient => {{
+            ingredientOrder.forEach(ingredient => {
                 const ingredientCell = document.createElement('td');
                 ingredientCell.className = 'ingredient-header';
                 ingredientCell.textContent = ingredient;
                 ingredientCell.title = ingredient;
-                ingredientCell.style.fontSize = '10px';
-                ingredientCell.style.textAlign = 'center';
-                ingredientCell.style.writingMode = 'vertical-rl';
-                ingredientCell.style.textOrientation = 'mixed';
-                ingredientCell.style.padding = '4px 2px';
                 ingredientRow.appendChild(ingredientCell);
-            }});
+            });
             
-            table.appendChild(ingredientRow);
-        }}
+            fragment.appendChild(ingredientRow);
+            table.appendChild(fragment);
+        }
+        
+        // Cell indices sorted by value (filled by loadPayload), so a threshold change
+        // only repaints the cells whose value lies between the old and the new threshold
+        let sortedCellOrder, sortedValues;
+        
+        // Color class each cell shows when at or above the threshold; it depends only
+        // on the value, so it is worked out once by loadPayload rather than per repaint
+        let valueClasses;
+        
+        // First position in a sorted array whose value is >= target
+        function lowerBound(values, target) {
+            let lo = 0;
+            let hi = values.length;
+            while (lo < hi) {
+                const mid = (lo + hi) >>> 1;
+                if (values[mid] < target) {
+                    lo = mid + 1;
+                } else {
+                    hi = mid;
+                }
+            }
+            return lo;
+        }
         
-        function updateHeatmap() {{
-            const cells = document.querySelectorAll('.heatmap-cell');
+        // Colors come from class tokens (and CSS variables) rather than inline
+        // styles; each cell remembers its color class so it can be swapped in place
+        // With no recipes selected all rows show in full color; otherwise
+        // rows that are not selected are shown with reduced transparency
+        function isRowFaded(rowIndex) {
+            return selectedCount > 0 && !selectedRows[rowIndex];
+        }
+        
+        // rowFaded is isRowFaded() of the cell's row, looked up once per row by callers
+        function paintCell(idx, rowFaded) {
+            const cell = heatmapCells[idx];
+            const value = heatmapData[idx];
+            let colorClass = 'below';  // Below threshold - light gray
+            let faded = false;
             
-            cells.forEach(cell => {{
-                const recipe = cell.dataset.recipe;
-                const value = parseFloat(cell.dataset.value);
-                const isSelected = selectedRecipes.has(recipe);
-                const isAboveThreshold = value >= currentThreshold;
-                
-                if (isAboveThreshold) {{
-                    if (selectedRecipes.size === 0) {{
-                        // No recipes selected - show all in full color
-                        cell.style.backgroundColor = getColor(value, 1);
-                        cell.textContent = '';
-                    }} else if (isSelected) {{
-                        // Recipe is selected - show in full color
-                        cell.style.backgroundColor = getColor(value, 1);
-                        cell.textContent = '';
-                    }} else {{
-                        // Recipe not selected - show with reduced transparency
-                        cell.style.backgroundColor = getColor(value, 0.1);
-                        cell.textContent = '';
-                    }}
-                }} else {{
-                    // Below threshold - light gray
-                    cell.style.backgroundColor = '#f0f0f0';
-                    cell.textContent = '';
-                }}
-            }});
-        }}
-        
-        function showTooltip(event) {{
+            if (value >= currentThreshold) {
+                colorClass = valueClasses[idx];
+                faded = rowFaded;
+            }
+            
+            const previous = cellColorClasses[idx];
+            if (previous !== colorClass) {
+                if (previous) {
+                    cell.classList.replace(previous, colorClass);
+                } else {
+                    cell.classList.add(colorClass);
+                }
+                cellColorClasses[idx] = colorClass;
+            }
+            cell.classList.toggle('deselected', faded);
+        }
+        
+        // Full repaint, used on load and whenever the selection changes
+        function updateHeatmap() {
+            for (let rowIndex = 0; rowIndex < recipeOrder.length; rowIndex++) {
+                repaintRow(rowIndex);
+            }
+            paintedThreshold = currentThreshold;
+        }
+        
+        // Repaint the cells of one recipe row at the current threshold
+        function repaintRow(rowIndex) {
+            const rowFaded = isRowFaded(rowIndex);
+            const end = (rowIndex + 1) * numCols;
+            for (let idx = rowIndex * numCols; idx < end; idx++) {
+                paintCell(idx, rowFaded);
+            }
+        }
+        
+        // Repaint only the cells that crossed between the painted and current threshold
+        function updateThresholdBand() {
+            const start = lowerBound(sortedValues, Math.min(paintedThreshold, currentThreshold));
+            const end = lowerBound(sortedValues, Math.max(paintedThreshold, currentThreshold));
+            for (let k = start; k < end; k++) {
+                const idx = sortedCellOrder[k];
+                paintCell(idx, isRowFaded((idx / numCols) | 0));
+            }
+            paintedThreshold = currentThreshold;
+        }
+        
+        function showTooltip(cell) {
             const tooltip = document.getElementById('tooltip');
-            const recipe = event.target.dataset.recipe;
-            const ingredient = event.target.dataset.ingredient;
-            const value = event.target.dataset.value;
+            const idx = +cell.dataset.idx;
+            const recipe = recipeOrder[(idx / numCols) | 0];
+            const ingredient = ingredientOrder[idx % numCols];
+            const value = heatmapData[idx];
             
             tooltip.innerHTML = `
-                <strong>Recipe:</strong> ${{recipe}}<br>
-                <strong>Ingredient:</strong> ${{ingredient}}<br>
-                <strong>Value:</strong> ${{value}}
+                <strong>Recipe:</strong> ${recipe}<br>
+                <strong>Ingredient:</strong> ${ingredient}<br>
+                <strong>Value:</strong> ${value.toFixed(3)}
             `;
             tooltip.style.display = 'block';
-        }}
+        }
         
-        function hideTooltip() {{
+        function hideTooltip() {
             const tooltip = document.getElementById('tooltip');
             tooltip.style.display = 'none';
-        }}
+        }
         
-        function moveTooltip(event) {{
+        function moveTooltip(event) {
             const tooltip = document.getElementById('tooltip');
             tooltip.style.left = event.pageX + 10 + 'px';
             tooltip.style.top = event.pageY + 10 + 'px';
-        }}
+        }
         
-        // Threshold input handler
-        document.getElementById('threshold-input').addEventListener('input', function(event) {{
-            currentThreshold = parseFloat(event.target.value) || 0;
-            updateHeatmap();
-        }});
+        // Tooltip handlers, delegated from the table to its data cells
+        const heatmapTable = document.getElementById('heatmap-table');
+        heatmapTable.addEventListener('mouseover', function(event) {
+            const cell = event.target.closest('.heatmap-cell');
+            if (cell) showTooltip(cell);
+        });
+        heatmapTable.addEventListener('mouseout', function(event) {
+            if (event.target.closest('.heatmap-cell')) hideTooltip();
+        });
+        heatmapTable.addEventListener('mousemove', function(event) {
+            if (event.target.closest('.heatmap-cell')) moveTooltip(event);
+        });
+        
+        // Coalesce bursts of input events into one repaint per frame
+        function scheduleUpdate() {
+            if (updatePending) return;
+            updatePending = true;
+            requestAnimationFrame(() => {
+                updatePending = false;
+                updateThresholdBand();
+            });
+        }
+        
+        // Decode a base64 string and gunzip it with the browser's native decompressor
+        async function gunzipBase64(data) {
+            if (typeof DecompressionStream === 'undefined') {
+                throw new Error('this browser cannot decompress the embedded data ' +
+                    '(DecompressionStream is not supported). Please open the file in a ' +
+                    'current version of Chrome, Edge, Firefox or Safari.');
+            }
+            const bytes = Uint8Array.from(atob(data), c => c.charCodeAt(0));
+            const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+            return new Response(stream).arrayBuffer();
+        }
+        
+        async function loadPayload() {
+            const [labelsBuffer, heatmapBuffer] = await Promise.all([
+                gunzipBase64(labelsGzipBase64),
+                gunzipBase64(heatmapGzipBase64)
+            ]);
+            ({ recipeOrder, ingredientOrder, groupSizes, displayNames } =
+                JSON.parse(new TextDecoder().decode(labelsBuffer)));
+            numCols = ingredientOrder.length;
+            selectedRows = new Uint8Array(recipeOrder.length);
+            
+            ingredientGroupByIndex = [];
+            Object.entries(groupSizes).forEach(([groupName, size]) => {
+                for (let i = 0; i < size; i++) ingredientGroupByIndex.push(groupName);
+            });
+            heatmapData = new Float32Array(heatmapBuffer);
+            
+            sortedCellOrder = Uint32Array.from(heatmapData.keys())
+                .sort((a, b) => heatmapData[a] - heatmapData[b]);
+            sortedValues = Float32Array.from(sortedCellOrder, i => heatmapData[i]);
+            
+            valueClasses = Array.from(heatmapData, value => value > 0
+                ? binClasses[Math.round(Math.min(value, 1) * (colorBinCount - 1))]
+                : 'blank');
+        }
         
         // Initialize the heatmap
-        function initialize() {{
+        async function initialize() {
+            await loadPayload();
             createHeatmap();
             updateHeatmap();
             
+            // Threshold input handler, attached once the grid exists
+            document.getElementById('threshold-input').addEventListener('input', function(event) {
+                const threshold = Math.fround(parseFloat(event.target.value) || 0);
+                // Edits that parse to the same value (e.g. "0.4" -> "0.40") need no repaint
+                if (threshold === currentThreshold) return;
+                currentThreshold = threshold;
+                scheduleUpdate();
+            });
+            
             console.log('Interactive Tobacco Heatmap loaded successfully!');
-            console.log(`Recipes: ${{recipeOrder.length}}, Ingredients: ${{ingredientOrder.length}}`);
-        }}
+            console.log(`Recipes: ${recipeOrder.length}, Ingredients: ${ingredientOrder.length}`);
+        }
+        
+        // Show load failures in place of the heatmap instead of leaving an empty table
+        function showLoadError(error) {
+            const message = document.createElement('div');
+            message.className = 'load-error';
+            message.textContent = `Could not load the heatmap: ${error.message || error}`;
+            document.querySelector('.heatmap-wrapper').appendChild(message);
+            console.error(error);
+        }
         
         // Start the application
-        initialize();
+        initialize().catch(showLoadError);
     </script>
 </body>
 </html>"""
+
+def write_color_classes(f, lut):
+    """Write one CSS class per color bin, each setting the --cell-rgb variable"""
+    f.write("        \n")
+    for i, (r, g, b) in enumerate(lut):
+        f.write(f"        .v{i} {{ --cell-rgb: {r}, {g}, {b}; }}\n")
+
+def gzip_base64(data):
+    """Gzip bytes reproducibly (fixed mtime) and base64-encode them for embedding"""
+    return base64.b64encode(gzip.compress(data, compresslevel=9, mtime=0)).decode('ascii')
+
+def write_js_const(f, name, value):
+    """Write a JavaScript const declaration holding compact JSON"""
+    f.write(f"        const {name} = ")
+    json.dump(value, f, separators=(',', ':'))
+    f.write(";\n")
+
+def generate_html_file(f, heatmap_values, recipe_order, ingredient_order, recipe_groups, ingredient_groups, tobacco_groups):
+    """Stream the standalone HTML file with embedded JavaScript to an open file"""
     
-    return html_content
+    # Group headers for display
+    group_headers = {
+        'G1 - MGO and Filed': 'G1',
+        'G2': 'G2', 
+        'G3': 'G3',
+        'G4 - Unique': 'G4'
+    }
+    
+    # Row labels, prefixed with the short group header when the recipe has one
+    display_names = []
+    for recipe in recipe_order:
+        group_name = recipe_groups.get(recipe)
+        display_names.append(f"{group_headers[group_name]}-{recipe}" if group_name in group_headers else recipe)
+    
+    # Count the columns of each sensory group; ingredient_order keeps each group
+    # contiguous, so the page derives column groups and boundaries from these sizes
+    sensory_group_order = ['Sweet', 'Dry', 'Rich', 'Light', 'Smooth', 'Harsh', 'Cooling', 'Ungrouped']
+    group_sizes = dict.fromkeys(sensory_group_order, 0)
+    for ingredient in ingredient_order:
+        group_sizes[ingredient_groups.get(ingredient, 'Ungrouped')] += 1
+    
+    # Name lists repeat long ingredient names, so they travel gzip-compressed
+    # alongside the matrix and are inflated by the page on load
+    labels = {
+        'recipeOrder': recipe_order,
+        'ingredientOrder': ingredient_order,
+        'groupSizes': group_sizes,
+        'displayNames': display_names
+    }
+    labels_json = json.dumps(labels, separators=(',', ':')).encode('utf-8')
+    
+    # Stream the static page with the data payloads written straight into the script tag
+    f.write(HTML_HEADER)
+    write_color_classes(f, build_viridis_lut(COLOR_BINS))
+    f.write(HTML_BODY)
+    write_js_const(f, 'heatmapGzipBase64', gzip_base64(heatmap_values.tobytes()))
+    write_js_const(f, 'labelsGzipBase64', gzip_base64(labels_json))
+    write_js_const(f, 'colorBinCount', COLOR_BINS)
+    f.write(HTML_FOOTER)
 
 def main():
     """Main function to generate the standalone HTML file"""
@@ -803,18 +1015,19 @@ def main():
         df, tobacco_groups, sensory_groups
     )
     
+    # Build the display matrix once and hand the array to the page writer
+    heatmap_values = build_display_matrix(df, recipe_order, ingredient_order)
+    
     # Generate HTML
     print("\n🌐 GENERATING HTML FILE")
     print("-" * 40)
     
-    html_content = generate_html_file(
-        df, recipe_order, ingredient_order, recipe_groups, ingredient_groups, tobacco_groups
-    )
-    
     # Save HTML file
     output_file = 'tobacco_heatmap_standalone.html'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        generate_html_file(
+            f, heatmap_values, recipe_order, ingredient_order, recipe_groups, ingredient_groups, tobacco_groups
+        )
     
     file_size = os.path.getsize(output_file) / 1024  # KB
     
@@ -828,7 +1041,7 @@ def main():
     
     print("\n" + "=" * 70)
     print("🎉 STANDALONE HEATMAP READY!")
-    print(f"📂 Open '{output_file}' in any web browser")
+    print(f"📂 Open '{output_file}' in any modern web browser")
     print("💡 Features:")
     print("   - Click recipe buttons to highlight rows")
     print("   - Adjust threshold to filter low values")